@@ -7,16 +7,19 @@ from pathlib import Path
 
 def calculate_accuracy(predictions, ground_truth):
     """Calculate accuracy metrics"""
-    predictions = np.array(predictions)
-    ground_truth = np.array(ground_truth)
-    
-    errors = np.abs(predictions - ground_truth)
-    
+    predictions = np.asarray(predictions, dtype=np.float64)
+    ground_truth = np.asarray(ground_truth, dtype=np.float64)
+
+    # Reuse the difference buffer for the absolute errors
+    errors = np.subtract(predictions, ground_truth)
+    np.abs(errors, out=errors)
+    n = errors.size
+
     return {
-        "max_error": float(np.max(errors)),
-        "mean_error": float(np.mean(errors)),
-        "rmse": float(np.sqrt(np.mean(errors ** 2))),
-        "exact_matches": int(np.sum(errors < 1e-6))
+        "max_error": float(errors.max()),
+        "mean_error": float(errors.sum() / n),
+        "rmse": float(np.sqrt(np.dot(errors, errors) / n)),
+        "exact_matches": int(np.count_nonzero(errors < 1e-6))
     }
 
 def main():
@@ -147,7 +147,7 @@ async function main() {
             totalSamples: testData.nSamples,
             totalTimeMs: totalTime,
             predictionsPerSecond: Math.floor(testData.nSamples / (totalTime / 1000)),
-            predictions: results.predictions.slice(0, 1000), // Save first 1000 for verification
+            predictions: Array.from(results.predictions.slice(0, 1000)), // Save first 1000 for verification
             groundTruth: Array.from(testData.groundTruth.slice(0, 1000)),
             workerTimeMs: results.executionTime
         };
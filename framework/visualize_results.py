@@ -2,10 +2,14 @@
 
 import json
 import argparse
+import matplotlib
+matplotlib.use('Agg')  # Non-interactive backend; plots are only written to files
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
 
+plt.rcParams['savefig.dpi'] = 100
+
 def load_report(file_path):
     """Load experiment report"""
     with open(file_path, 'r') as f:
@@ -18,24 +22,23 @@ def plot_batch_size_performance(report, output_dir):
     batch_sizes = [r['batchSize'] for r in batch_results]
     pred_per_sec = [r['predictionsPerSecond'] for r in batch_results]
     
-    plt.figure(figsize=(10, 6))
-    plt.semilogx(batch_sizes, pred_per_sec, 'bo-', linewidth=2, markersize=8)
-    plt.xlabel('Batch Size')
-    plt.ylabel('Predictions per Second')
-    plt.title(f'Performance vs Batch Size - {report["model"]["name"]}')
-    plt.grid(True, alpha=0.3)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.semilogx(batch_sizes, pred_per_sec, 'bo-', linewidth=2, markersize=8)
+    ax.set_xlabel('Batch Size')
+    ax.set_ylabel('Predictions per Second')
+    ax.set_title(f'Performance vs Batch Size - {report["model"]["name"]}')
+    ax.grid(True, alpha=0.3)
     
     # Mark best performance
     best_idx = np.argmax(pred_per_sec)
-    plt.plot(batch_sizes[best_idx], pred_per_sec[best_idx], 'r*', markersize=15)
-    plt.annotate(f'Best: {pred_per_sec[best_idx]:,.0f} pred/s', 
+    ax.plot(batch_sizes[best_idx], pred_per_sec[best_idx], 'r*', markersize=15)
+    ax.annotate(f'Best: {pred_per_sec[best_idx]:,.0f} pred/s', 
                 xy=(batch_sizes[best_idx], pred_per_sec[best_idx]),
                 xytext=(10, 10), textcoords='offset points',
                 bbox=dict(boxstyle='round,pad=0.5', fc='yellow', alpha=0.5))
     
-    plt.tight_layout()
-    plt.savefig(output_dir / 'batch_size_performance.png', dpi=150)
-    plt.close()
+    fig.savefig(output_dir / 'batch_size_performance.png', bbox_inches='tight')
+    plt.close(fig)
 
 def plot_error_distribution(report, output_dir):
     """Plot error distribution"""
@@ -44,21 +47,20 @@ def plot_error_distribution(report, output_dir):
     labels = list(error_dist.keys())
     values = list(error_dist.values())
     
-    plt.figure(figsize=(10, 6))
-    plt.bar(range(len(labels)), values, color='skyblue', edgecolor='navy')
-    plt.xticks(range(len(labels)), labels, rotation=45)
-    plt.ylabel('Number of Predictions')
-    plt.title(f'Error Distribution - {report["model"]["name"]}')
-    plt.yscale('log')
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.bar(range(len(labels)), values, color='skyblue', edgecolor='navy')
+    ax.set_xticks(range(len(labels)), labels, rotation=45)
+    ax.set_ylabel('Number of Predictions')
+    ax.set_title(f'Error Distribution - {report["model"]["name"]}')
+    ax.set_yscale('log')
     
     # Add value labels on bars
     for i, v in enumerate(values):
         if v > 0:
-            plt.text(i, v, f'{v:,}', ha='center', va='bottom')
+            ax.text(i, v, f'{v:,}', ha='center', va='bottom')
     
-    plt.tight_layout()
-    plt.savefig(output_dir / 'error_distribution.png', dpi=150)
-    plt.close()
+    fig.savefig(output_dir / 'error_distribution.png', bbox_inches='tight')
+    plt.close(fig)
 
 def plot_percentile_errors(report, output_dir):
     """Plot error percentiles"""
@@ -68,23 +70,22 @@ def plot_percentile_errors(report, output_dir):
     p_labels = ['p50', 'p90', 'p95', 'p99', 'p99.9']
     errors = [percentiles.get(label, 0) for label in p_labels]
     
-    plt.figure(figsize=(10, 6))
-    plt.semilogy(p_values, errors, 'ro-', linewidth=2, markersize=8)
-    plt.xlabel('Percentile')
-    plt.ylabel('Absolute Error')
-    plt.title(f'Error Percentiles - {report["model"]["name"]}')
-    plt.grid(True, alpha=0.3)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.semilogy(p_values, errors, 'ro-', linewidth=2, markersize=8)
+    ax.set_xlabel('Percentile')
+    ax.set_ylabel('Absolute Error')
+    ax.set_title(f'Error Percentiles - {report["model"]["name"]}')
+    ax.grid(True, alpha=0.3)
     
     # Add value labels
     for i, (p, e) in enumerate(zip(p_values, errors)):
-        plt.annotate(f'{e:.6f}', 
+        ax.annotate(f'{e:.6f}', 
                     xy=(p, e),
                     xytext=(0, 10), textcoords='offset points',
                     ha='center')
     
-    plt.tight_layout()
-    plt.savefig(output_dir / 'error_percentiles.png', dpi=150)
-    plt.close()
+    fig.savefig(output_dir / 'error_percentiles.png', bbox_inches='tight')
+    plt.close(fig)
 
 def generate_summary_plot(report, output_dir):
     """Generate a summary plot with key metrics"""
@@ -139,9 +140,9 @@ def generate_summary_plot(report, output_dir):
     ax4.axis('off')
     ax4.set_title('Status')
     
-    plt.tight_layout()
-    plt.savefig(output_dir / 'summary.png', dpi=150)
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(output_dir / 'summary.png', bbox_inches='tight')
+    plt.close(fig)
 
 def main():
     parser = argparse.ArgumentParser(description='Visualize experiment results')
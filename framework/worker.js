@@ -72,14 +72,14 @@ async function runPredictions() {
         
         parentPort.postMessage({ type: 'status', message: `Completed ${totalSamples.toLocaleString()} predictions in ${executionTime}ms` });
         
-        // Send results
+        // Send results, transferring the predictions buffer instead of copying it
         parentPort.postMessage({
             type: 'complete',
             results: {
-                predictions: Array.from(predictions),
+                predictions: predictions,
                 executionTime: executionTime
             }
-        });
+        }, [predictions.buffer]);
         
     } catch (error) {
         console.error('Worker error:', error);
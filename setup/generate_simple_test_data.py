@@ -1,17 +1,17 @@
 #!/usr/bin/env python3
 
 import json
-import struct
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import numpy as np
-import pandas as pd
-from catboost import CatBoostRegressor
+from catboost import CatBoostRegressor, FeaturesData
 import seaborn as sns
 
 def generate_simple_test_data():
     print("🎲 Generating simple test data (numeric encoding for categoricals)...")
     
-    # Set random seed
-    np.random.seed(42)
+    # Seeded PCG64 generator shared by all draws
+    rng = np.random.default_rng(42)
     
     # Load the diamonds dataset to understand value ranges
     diamonds = sns.load_dataset('diamonds')
@@ -24,68 +24,81 @@ def generate_simple_test_data():
     print(f"   Generating {n_samples:,} test vectors")
     
     # Generate features based on actual data distributions
-    features = np.zeros((n_samples, 9), dtype=np.float32)
-    
-    # Numeric features
-    features[:, 0] = np.random.uniform(diamonds['carat'].min(), diamonds['carat'].max(), n_samples)  # carat
-    features[:, 1] = np.random.uniform(diamonds['depth'].min(), diamonds['depth'].max(), n_samples)  # depth
-    features[:, 2] = np.random.uniform(diamonds['table'].min(), diamonds['table'].max(), n_samples)  # table
-    features[:, 3] = np.random.uniform(diamonds['x'].min(), diamonds['x'].max(), n_samples)         # x
-    features[:, 4] = np.random.uniform(diamonds['y'].min(), diamonds['y'].max(), n_samples)         # y
-    features[:, 5] = np.random.uniform(diamonds['z'].min(), diamonds['z'].max(), n_samples)         # z
+    # Numeric features, drawn uniformly within the observed range of each column
+    col_ranges = diamonds[['carat', 'depth', 'table', 'x', 'y', 'z']].agg(['min', 'max'])
+    lo = col_ranges.loc['min'].to_numpy()
+    hi = col_ranges.loc['max'].to_numpy()
+    numeric = rng.uniform(lo, hi, size=(n_samples, 6)).astype(np.float32, copy=False)
     
     # Categorical features (as numeric indices)
     cut_values = ['Fair', 'Good', 'Very Good', 'Premium', 'Ideal']
     color_values = ['D', 'E', 'F', 'G', 'H', 'I', 'J']
     clarity_values = ['I1', 'SI2', 'SI1', 'VS2', 'VS1', 'VVS2', 'VVS1', 'IF']
     
-    features[:, 6] = np.random.randint(0, len(cut_values), n_samples)     # cut index
-    features[:, 7] = np.random.randint(0, len(color_values), n_samples)   # color index
-    features[:, 8] = np.random.randint(0, len(clarity_values), n_samples) # clarity index
+    # Columns: cut index, color index, clarity index
+    k_arr = [len(cut_values), len(color_values), len(clarity_values)]
+    cat_idx = rng.integers(0, k_arr, size=(n_samples, 3), dtype=np.int8)
     
     print("🔮 Generating ground truth predictions...")
     
-    # Create DataFrame for predictions with proper categorical values
-    df_for_predictions = pd.DataFrame({
-        'carat': features[:, 0],
-        'depth': features[:, 1],
-        'table': features[:, 2],
-        'x': features[:, 3],
-        'y': features[:, 4],
-        'z': features[:, 5],
-        'cut': [cut_values[int(i)] for i in features[:, 6]],
-        'color': [color_values[int(i)] for i in features[:, 7]],
-        'clarity': [clarity_values[int(i)] for i in features[:, 8]]
-    })
+    # Lookup tables for decoding categorical indices with one fancy-index gather per column
+    cat_lookups = [
+        np.array(cut_values, dtype=object),
+        np.array(color_values, dtype=object),
+        np.array(clarity_values, dtype=object)
+    ]
+    
+    # FeaturesData skips pandas dtype inference
+    num_names = ['carat', 'depth', 'table', 'x', 'y', 'z']
+    cat_names = ['cut', 'color', 'clarity']
     
     # Get predictions in batches
     batch_size = 100000
-    predictions = np.zeros(n_samples, dtype=np.float32)
-    
-    # Create Pool with explicit categorical features
-    from catboost import Pool
     
-    for i in range(0, n_samples, batch_size):
-        end = min(i + batch_size, n_samples)
-        batch = df_for_predictions.iloc[i:end]
-        pool = Pool(batch, cat_features=['cut', 'color', 'clarity'])
-        predictions[i:end] = model.predict(pool).astype(np.float32)
-        print(f"   Progress: {i:,}/{n_samples:,}")
+    # Whole file image (header, features, predictions) so it is written in one pass;
+    # predictions are filled in place in the tail of the buffer
+    out = np.empty(4 + n_samples * 9 + n_samples, dtype=np.float32)
+    predictions = out[4 + n_samples * 9:]
+    
+    # CatBoost releases the GIL while predicting, so batches run concurrently.
+    # Each call is pinned to 2 threads to avoid oversubscribing its own pool.
+    # Category strings are decoded per batch, so only int8 codes are held for all rows.
+    def predict_batch(i, end):
+        batch_idx = cat_idx[i:end]
+        cat_block = np.stack([lookup[batch_idx[:, k]] for k, lookup in enumerate(cat_lookups)], axis=1)
+        fd = FeaturesData(
+            num_feature_data=numeric[i:end],
+            cat_feature_data=cat_block,
+            num_feature_names=num_names,
+            cat_feature_names=cat_names
+        )
+        batch_pred = model.predict(fd, prediction_type='RawFormulaVal', thread_count=2)
+        np.copyto(predictions[i:end], batch_pred, casting='same_kind')
+        return end
+    
+    ranges = [(i, min(i + batch_size, n_samples)) for i in range(0, n_samples, batch_size)]
+    max_workers = max(1, (os.cpu_count() or 2) // 2)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(predict_batch, i, end) for i, end in ranges]
+        for done, future in enumerate(as_completed(futures), 1):
+            future.result()
+            print(f"   Progress: {done}/{len(ranges)} batches")
     
     print("💾 Saving test data...")
     
     # Write binary file with correct format
     binary_path = '../models/test_data.bin'
+    
+    # Header (magic, version, nSamples, nFeatures)
+    out[:4].view(np.uint32)[:] = [0xCAFEBABE, 1, n_samples, 9]
+    
+    # Features (format v1 stores categorical indices as float32)
+    features = out[4:4 + n_samples * 9].reshape(n_samples, 9)
+    features[:, :6] = numeric
+    features[:, 6:] = cat_idx
+    
     with open(binary_path, 'wb') as f:
-        # Write header (magic, version, nSamples, nFeatures)
-        header = struct.pack('IIII', 0xCAFEBABE, 1, n_samples, 9)
-        f.write(header)
-        
-        # Write features
-        features.tofile(f)
-        
-        # Write ground truth predictions
-        predictions.tofile(f)
+        out.tofile(f)
     
     file_size = (16 + n_samples * 9 * 4 + n_samples * 4) / (1024 * 1024)
     print(f"   Saved binary data: {binary_path} ({file_size:.1f} MB)")
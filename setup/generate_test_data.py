@@ -3,9 +3,13 @@
 import json
 import struct
 import os
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pandas as pd
-from catboost import CatBoostRegressor
+from catboost import CatBoostRegressor, Pool
+
+# Binary format V2 header: magic, version, n_samples, n_float_features, n_cat_features
+HEADER_V2 = struct.Struct("<IIIII")
 
 
 def generate_test_data():
@@ -15,8 +19,8 @@ def generate_test_data():
     with open("../models/model_metadata.json", "r") as f:
         metadata = json.load(f)
 
-    # Set random seed for reproducibility
-    np.random.seed(42)
+    # Seeded generator for reproducibility
+    rng = np.random.default_rng(42)
 
     # Number of test samples
     n_samples = 1_000_000
@@ -25,19 +29,31 @@ def generate_test_data():
     # Generate test data
     test_data = {}
 
-    # Generate numeric features
-    for feature, ranges in metadata["feature_ranges"].items():
-        mean = ranges["mean"]
-        std = ranges["std"]
-        min_val = ranges["min"]
-        max_val = ranges["max"]
-
-        values = np.random.normal(mean, std, n_samples)
-        values = np.clip(values, min_val, max_val)
-        test_data[feature] = values
-        print(f"   Generated {feature}: [{min_val:.2f}, {max_val:.2f}]")
-
-    # Generate categorical features (keep as strings)
+    # Generate numeric features concurrently (NumPy releases the GIL while
+    # sampling), each from its own child generator for reproducibility.
+    # Values are drawn as float32, the precision stored in the binary file.
+    def generate_numeric(feature_rng, ranges):
+        values = feature_rng.standard_normal(n_samples, dtype=np.float32)
+        values *= ranges["std"]
+        values += ranges["mean"]
+        np.clip(values, ranges["min"], ranges["max"], out=values)
+        return values
+
+    feature_ranges = metadata["feature_ranges"]
+    child_rngs = rng.spawn(len(feature_ranges))
+    with ThreadPoolExecutor(max_workers=len(feature_ranges)) as executor:
+        futures = {
+            feature: executor.submit(generate_numeric, feature_rng, ranges)
+            for (feature, ranges), feature_rng in zip(feature_ranges.items(), child_rngs)
+        }
+        for feature, future in futures.items():
+            test_data[feature] = future.result()
+            ranges = feature_ranges[feature]
+            print(f"   Generated {feature}: [{ranges['min']:.2f}, {ranges['max']:.2f}]")
+
+    # Generate categorical features as integer codes; the prediction frame sees
+    # them as pandas Categoricals with the string labels
+    code_arrays = {}
     for feature, categories in metadata["categorical_values"].items():
         if feature == "cut":
             weights = [0.05, 0.15, 0.25, 0.30, 0.25]
@@ -50,30 +66,22 @@ def generate_test_data():
         else:
             weights = None
 
-        values = np.random.choice(categories, n_samples, p=weights)
-        test_data[feature] = values
+        codes = rng.choice(len(categories), n_samples, p=weights).astype(np.int8)
+        code_arrays[feature] = codes
+        test_data[feature] = pd.Categorical.from_codes(codes, categories=categories)
         print(f"   Generated {feature}: {len(categories)} categories")
 
-    # Create DataFrame
-    test_df = pd.DataFrame(test_data)
-    test_df = test_df[metadata["features"]]
+    # Create DataFrame directly in model feature order, without copying columns
+    ordered = {feat: test_data[feat] for feat in metadata["features"]}
+    test_df = pd.DataFrame(ordered, copy=False)
 
-    # Generate ground truth predictions
-    print("\n🔮 Generating ground truth predictions...")
+    # Load the model and build the Pool before touching the output file, so a
+    # missing model or bad frame cannot leave a half-written test data file
     model = CatBoostRegressor()
     model.load_model("../models/baseline.cbm")
 
-    batch_size = 10000
-    predictions = []
-
-    for i in range(0, n_samples, batch_size):
-        batch = test_df.iloc[i : i + batch_size]
-        batch_pred = model.predict(batch)
-        predictions.extend(batch_pred)
-        if i % 100000 == 0:
-            print(f"   Progress: {i:,}/{n_samples:,}")
-
-    predictions = np.array(predictions, dtype=np.float32)
+    # Build the Pool once; batches are row slices of it
+    pool = Pool(test_df, cat_features=metadata["categorical_features"])
 
     # Save test data in new format
     print("\n💾 Saving test data...")
@@ -93,65 +101,61 @@ def generate_test_data():
     cat_encodings = {}
     for feature in metadata["categorical_features"]:
         categories = metadata["categorical_values"][feature]
-        cat_encodings[feature] = {cat: i for i, cat in enumerate(categories)}
+        cat_encodings[feature] = dict(zip(categories, range(len(categories))))
 
     # Binary format V2:
     # Header: magic (4), version (4), n_samples (4), n_float_features (4), n_cat_features (4)
     # For each sample: 6 floats + 3 uint8 categorical indices + 1 byte padding
 
+    # Everything is written to a temporary sibling that replaces test_data.bin
+    # only once the ground truth is complete
     binary_path = "../models/test_data.bin"
-    with open(binary_path, "wb") as f:
+    tmp_path = binary_path + ".tmp"
+    with open(tmp_path, "wb") as f:
         # Write header
-        header = struct.pack("IIIII", 0xCAFEBABE, 2, n_samples, 6, 3)
-        f.write(header)
+        f.write(HEADER_V2.pack(0xCAFEBABE, 2, n_samples, 6, 3))
 
-        # Pre-extract numeric data as numpy arrays for efficient access
-        numeric_data = {
-            feat: test_df[feat].values.astype(np.float32)
-            for feat in metadata["numeric_features"]
-        }
+        # Lay out all samples at once as packed records matching the V2 layout
+        sample_dtype = np.dtype(
+            [("f", "<f4", (6,)), ("c", "u1", (3,)), ("pad", "u1")]
+        )
+        samples = np.empty(n_samples, dtype=sample_dtype)
+        for k, feat in enumerate(metadata["numeric_features"]):
+            samples["f"][:, k] = test_data[feat]
+        for k, feat in enumerate(metadata["categorical_features"]):
+            samples["c"][:, k] = code_arrays[feat]
+        samples["pad"] = 0
+
+        samples.tofile(f)
+
+        # Reserve the ground truth region at the end; predictions are streamed into it
+        predictions_offset = HEADER_V2.size + samples.nbytes
+        f.truncate(predictions_offset + n_samples * 4)
+
+    # Generate ground truth predictions
+    print("\n🔮 Generating ground truth predictions...")
+
+    # Large batches amortize per-call overhead
+    batch_size = 250_000
+
+    # Map the reserved ground truth region so each batch lands directly on disk
+    predictions = np.memmap(
+        tmp_path,
+        dtype=np.float32,
+        mode="r+",
+        offset=predictions_offset,
+        shape=(n_samples,),
+    )
+
+    for i in range(0, n_samples, batch_size):
+        end = min(i + batch_size, n_samples)
+        batch = pool.slice(np.arange(i, end))
+        predictions[i:end] = model.predict(batch)
+        print(f"   Progress: {i:,}/{n_samples:,}")
 
-        # Pre-encode categorical data
-        categorical_indices = {}
-        for feat in metadata["categorical_features"]:
-            cat_values = test_df[feat].values
-            encoding = cat_encodings[feat]
-            indices = np.array([encoding[val] for val in cat_values], dtype=np.uint8)
-            categorical_indices[feat] = indices
-
-        # Write data in batches for better I/O performance
-        batch_size = 50000
-        buffer = bytearray(
-            batch_size * 28
-        )  # 6 floats (24 bytes) + 4 bytes (3 uint8 + padding)
-
-        for batch_start in range(0, n_samples, batch_size):
-            batch_end = min(batch_start + batch_size, n_samples)
-            batch_samples = batch_end - batch_start
-
-            # Fill buffer with batch data
-            offset = 0
-            for i in range(batch_start, batch_end):
-                # Pack 6 floats
-                for feat in metadata["numeric_features"]:
-                    struct.pack_into("f", buffer, offset, numeric_data[feat][i])
-                    offset += 4
-
-                # Pack 3 categorical indices + padding
-                for feat in metadata["categorical_features"]:
-                    buffer[offset] = categorical_indices[feat][i]
-                    offset += 1
-                buffer[offset] = 0  # padding
-                offset += 1
-
-            # Write only the filled portion of the buffer
-            f.write(buffer[: batch_samples * 28])
-
-            if batch_start % 200000 == 0:
-                print(f"   Saving progress: {batch_start:,}/{n_samples:,}")
-
-        # Write predictions at the end
-        predictions.astype(np.float32).tofile(f)
+    predictions.flush()
+    del predictions
+    os.replace(tmp_path, binary_path)
 
     file_size_mb = os.path.getsize(binary_path) / (1024 * 1024)
     print(f"   Saved binary data: {binary_path} ({file_size_mb:.1f} MB)")
@@ -165,7 +169,7 @@ def generate_test_data():
 
     mappings_path = "../models/categorical_mappings.json"
     with open(mappings_path, "w") as f:
-        json.dump(cat_mappings, f, indent=2)
+        json.dump(cat_mappings, f)
     print(f"   Saved categorical mappings: {mappings_path}")
 
     print("\n✅ Test data generation completed!")
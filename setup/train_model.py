@@ -41,6 +41,7 @@ def train_diamonds_model():
         loss_function='RMSE',
         cat_features=categorical_features,
         random_seed=42,
+        used_ram_limit='4GB',
         verbose=100
     )
     